@@ -1,5 +1,27 @@
-from typing import List
-from dto.Response import TodoResponse
+from dataclasses import dataclass
+from typing import Dict
 
-todos:List[TodoResponse] = []
-current_id = 1
\ No newline at end of file
+# storage type for the in-memory store. a slotted dataclass is much cheaper
+# than a BaseModel to create and mutate (no validators, no __dict__, no
+# per-attribute hooks) — the data was already validated by the request DTOs
+# before it gets here. TodoResponse in dto/ stays around purely as the schema.
+@dataclass(slots=True)
+class Todo:
+    id: int
+    title: str
+    completed: bool
+
+    def dict(self):
+        return {"id": self.id, "title": self.title, "completed": self.completed}
+
+
+# primary store is a dict keyed by id: O(1) get/update/delete instead of
+# scanning a list. dicts keep insertion order (python 3.7+), so we don't
+# need a separate list just to preserve ordering
+todos_by_id: Dict[int, Todo] = {}
+current_id = 1
+
+# sidecar cache of pre-lowercased titles so /search doesn't have to call
+# .lower() on every title on every request — maintained by the service
+# on create/update/delete
+title_lower_by_id: Dict[int, str] = {}
@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Response
+from fastapi.responses import ORJSONResponse
+from dto.CreateRequest import TodoCreateRequest as CreateRequest
+from dto.UpdateRequest import TodoUpdateRequest as UpdateRequest
+from service.TodoService import *
+
+# single canonical place the routes live — main.py just includes this router,
+# same layout as 04.FastapiRouter
+router = APIRouter()
+
+@router.get("/todos")
+async def read_todos():
+    # pre-encoded bytes straight from the service cache — no pydantic, no
+    # re-encode, no list iteration unless something changed since the last GET
+    return Response(content=get_all_json(), media_type="application/json")
+
+@router.get("/todos/{todo_id}")
+async def read_todo(todo_id: int):
+    todo = get_by_id(todo_id)
+    if todo:
+        return ORJSONResponse(todo.dict())
+    return {"error": "Todo not found"}
+
+# how to get url query parameters in fastapi
+@router.get("/search")
+async def search_todos(q: str = ""):
+    # matching lives in the service, which keeps pre-lowercased titles
+    # so the scan doesn't re-lowercase anything per request
+    return ORJSONResponse([todo.dict() for todo in search(q)])
+
+@router.post("/todos")
+async def create_todo(todo_data: CreateRequest):
+    return ORJSONResponse(create(todo_data).dict())
+
+@router.put("/todos/{todo_id}")
+async def update_todo(todo_id: int, todo_data: UpdateRequest):
+    updated_todo = update(todo_id, todo_data)
+    if updated_todo:
+        return ORJSONResponse(updated_todo.dict())
+    return {"error": "Todo not found"}
+
+@router.delete("/todos/{todo_id}")
+async def delete_todo(todo_id: int):
+    delete(todo_id)
+    return {"message": "Todo deleted"}
@@ -1,34 +1,149 @@
+import re
+import threading
+import msgspec
+from bisect import bisect_right
 from dto.CreateRequest import TodoCreateRequest as CreateRequest
-from dto.Response import TodoResponse
 from dto.UpdateRequest import TodoUpdateRequest as UpdateRequest
-from typing import List
-from models.Todo import todos, current_id
+from typing import Tuple
+from models.Todo import Todo, todos_by_id, title_lower_by_id, current_id
+
+# writers serialize on this lock; readers never take it. every write rebuilds
+# _todos_snapshot (an immutable tuple), and readers grab it with one atomic
+# attribute load — so a reader can never see a half-applied write even though
+# fastapi runs these sync handlers on a threadpool
+_lock = threading.Lock()
+_todos_snapshot: Tuple[Todo, ...] = ()
+
+# below this many todos the plain python loop is faster than building/scanning
+# the joined buffer, so keep the simple path for small stores
+_SCAN_THRESHOLD = 500
+
+# all lowercased titles joined into one NUL-separated string, so a search is a
+# single C-level regex pass instead of N python-level `in` checks. kept as one
+# (buf, offsets, ids) tuple so readers grab a consistent trio with a single
+# atomic attribute load — same snapshot discipline as _todos_snapshot below.
+# only writers publish it (from _rebuild_snapshot, under the lock): a reader
+# publishing a lazily built buffer could pin a pre-write copy as current,
+# the same stale-cache race the json cache below avoids by eager rebuild
+_search_buf = None  # (titles_buf, title_offsets, title_ids) or None
+
+def _build_search_buf():
+    offsets = []
+    ids = []
+    parts = []
+    pos = 0
+    # list() copies the items in one C-level step (atomic under the GIL),
+    # so a concurrent writer can't change the dict mid-iteration
+    for todo_id, title_low in list(title_lower_by_id.items()):
+        offsets.append(pos)
+        ids.append(todo_id)
+        parts.append(title_low)
+        pos += len(title_low) + 1  # +1 for the NUL separator
+    return ("\x00".join(parts), offsets, ids)
+
+# mirror struct for the wire format: msgspec encodes Structs with a C-level
+# codec, measurably faster than orjson over dicts for list payloads
+class _TodoStruct(msgspec.Struct):
+    id: int
+    title: str
+    completed: bool
+
+# pre-encoded JSON bytes for GET /todos — by far the hottest read. encoded
+# eagerly under the writer's lock whenever the snapshot changes, so the bytes
+# always match the latest committed write and readers do zero encoding work.
+# (a lazy encode-on-read could race a concurrent write and pin stale bytes
+# into the cache until the next mutation)
+_todos_json_cache = b"[]"  # store starts empty
+
+def _rebuild_snapshot():
+    global _todos_snapshot, _todos_json_cache, _search_buf
+    snapshot = tuple(todos_by_id.values())
+    _todos_snapshot = snapshot
+    _todos_json_cache = msgspec.json.encode(
+        [_TodoStruct(todo.id, todo.title, todo.completed) for todo in snapshot]
+    )
+    # the buffer is only scanned above the threshold, so small stores skip
+    # the O(n) join on every write; we're already O(n) here when it matters
+    _search_buf = _build_search_buf() if len(title_lower_by_id) > _SCAN_THRESHOLD else None
 
 def get_all():
-    return todos
+    return _todos_snapshot
+
+def get_all_json():
+    return _todos_json_cache
 
 def get_by_id(todo_id: int):
-    for todo in todos:
-        if todo.id == todo_id:
-            return todo
-    return None
+    return todos_by_id.get(todo_id)
+
+def search(q: str):
+    # lowercase the query once; titles were already lowercased at create/update
+    q_low = q.lower()
+    if not q_low:
+        # empty query matches everything, same as before
+        return get_all()
+    if len(title_lower_by_id) <= _SCAN_THRESHOLD or "\x00" in q_low:
+        results = []
+        for todo_id, title_low in list(title_lower_by_id.items()):
+            if q_low in title_low:
+                todo = todos_by_id.get(todo_id)
+                if todo:
+                    results.append(todo)
+        return results
+    # big store: one regex scan over the joined buffer, then map each match
+    # offset back to its todo via binary search. titles are NUL-separated and
+    # the query can't contain NUL here, so a match never straddles two titles.
+    # work off local references only — writers swap _search_buf at any point,
+    # so re-reading the global mid-scan could hand us a different build
+    buf_state = _search_buf
+    if buf_state is None:
+        # store just crossed the threshold before a writer republished; build
+        # a private copy but do NOT publish it — only writers under the lock
+        # do, otherwise a pre-write build could overwrite a newer one
+        buf_state = _build_search_buf()
+    titles_buf, title_offsets, title_ids = buf_state
+    pattern = re.compile(re.escape(q_low))
+    seen = set()
+    results = []
+    for match in pattern.finditer(titles_buf):
+        i = bisect_right(title_offsets, match.start()) - 1
+        todo_id = title_ids[i]
+        if todo_id not in seen:
+            seen.add(todo_id)
+            todo = todos_by_id.get(todo_id)
+            if todo:
+                results.append(todo)
+    return results
 
 def create(todo_data: CreateRequest):
     global current_id
-    new_todo = TodoResponse(id=current_id, title=todo_data.title, completed=False)
-    todos.append(new_todo)
-    current_id += 1
+    with _lock:
+        # plain slotted dataclass — title already got validated on the inbound
+        # CreateRequest, so no pydantic work is needed here at all
+        new_todo = Todo(id=current_id, title=todo_data.title, completed=False)
+        todos_by_id[current_id] = new_todo
+        title_lower_by_id[current_id] = todo_data.title.lower()
+        current_id += 1
+        _rebuild_snapshot()
     return new_todo
 
 def update(todo_id: int, todo_data: UpdateRequest):
-    for todo in todos:
-        if todo.id == todo_id:
-            todo.title = todo_data.title
-            todo.completed = todo_data.completed
-            return todo
-    return None
+    with _lock:
+        if todo_id not in todos_by_id:
+            return None
+        # replace the object instead of mutating it so readers holding the old
+        # snapshot keep seeing consistent (title, completed) pairs
+        todo = Todo(id=todo_id, title=todo_data.title, completed=todo_data.completed)
+        todos_by_id[todo_id] = todo
+        title_lower_by_id[todo_id] = todo_data.title.lower()
+        _rebuild_snapshot()
+    return todo
 
 def delete(todo_id: int):
-    global todos
-    todos = [todo for todo in todos if todo.id != todo_id]
-
+    with _lock:
+        removed = todos_by_id.pop(todo_id, None) is not None
+        if removed:
+            # only rebuild the snapshot/caches when something actually changed —
+            # deleting a missing id shouldn't cost an allocation
+            title_lower_by_id.pop(todo_id, None)
+            _rebuild_snapshot()
+    return removed
@@ -1,8 +1,23 @@
-from fastapi import FastAPI
+import msgspec
+from fastapi import FastAPI, Response
 from dto.RequestDTO import RequestDTO
 from models.Products import products as products_db
 app = FastAPI()
 
+# wire-format mirror of RequestDTO so msgspec's C codec does the encoding
+# instead of pydantic + the default json encoder
+class ProductStruct(msgspec.Struct):
+    id: int
+    name: str
+    description: str
+    price: float
+    quantity: int
+
+# the product list is static, so encode it once at import and serve the bytes
+_products_json = msgspec.json.encode(
+    [ProductStruct(p.id, p.name, p.description, p.price, p.quantity) for p in products_db]
+)
+
 @app.get("/products")
 def get_products():
-    return products_db
\ No newline at end of file
+    return Response(content=_products_json, media_type="application/json")
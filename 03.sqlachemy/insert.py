@@ -1,5 +1,7 @@
-from database import SessionLocal, Blog 
+from sqlalchemy import insert
+from database import SessionLocal, Blog
 
+# old row-at-a-time version kept for reference:
 # db = SessionLocal()  # Create a new database session
 # new_blog = Blog(title="My First Blog", content="This is the content of my first blog post.")
 # db.add(new_blog)  # Add the new blog post to the session
@@ -7,20 +9,23 @@ from database import SessionLocal, Blog
 # db.refresh(new_blog)  # Refresh the instance to get the updated data from the database
 # print("New blog post inserted successfully.")
 # db.close()  # Close the database connection
+#
+# that was 3 roundtrips PER ROW (INSERT + COMMIT + the refresh SELECT).
+# Core insert with a list of dicts sends all rows in one executemany —
+# one roundtrip for the whole batch, and no refresh since we don't need
+# the generated ids here.
 
-
-# db = SessionLocal()  # Create a new database session
-# new_blog = Blog(title="My second Blog", content="This is the content of my second post.")
-# db.add(new_blog)  # Add the new blog post to the session
-# db.commit()  # Commit the transaction to save the changes to the database
-# db.refresh(new_blog)  # Refresh the instance to get the updated data from the database
-# print("New blog post inserted successfully.")
-# db.close()  # Close the database connection
+N = 3
+rows = [
+    {"title": f"Blog {i}", "content": f"This is the content of blog post {i}."}
+    for i in range(1, N + 1)
+]
 
 db = SessionLocal()  # Create a new database session
-new_blog = Blog(title="My third Blog", content="This is the content of my third post.")
-db.add(new_blog)  # Add the new blog post to the session
-db.commit()  # Commit the transaction to save the changes to the database
-db.refresh(new_blog)  # Refresh the instance to get the updated data from the database
-print("New blog post inserted successfully.")
-db.close()  # Close the database connection
\ No newline at end of file
+# chunk big seeds so one statement never exceeds postgres's parameter limit
+BATCH = 1000
+for start in range(0, len(rows), BATCH):
+    db.execute(insert(Blog), rows[start:start + BATCH])
+db.commit()  # one commit for the whole batch
+print(f"{len(rows)} blog posts inserted successfully.")
+db.close()  # Close the database connection
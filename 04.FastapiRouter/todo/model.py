@@ -1,15 +1,28 @@
+from dataclasses import dataclass
 from pydantic import BaseModel
 
-#Request DTO 
+#Request DTO
 class TodoCreateRequest(BaseModel):
     title: str
 
-#Response DTO
+#Response DTO — kept as the OpenAPI schema only (see responses= in routes.py)
 class TodoResponse(BaseModel):
     id: int
     title: str
     completed: bool
 
+# storage type for the in-memory store. a slotted dataclass has no validators,
+# no __dict__ and no __setattr__ hooks, so it's far cheaper to create than a
+# BaseModel — and everything stored here already passed request validation
+@dataclass(slots=True)
+class Todo:
+    id: int
+    title: str
+    completed: bool
+
+    def dict(self):
+        return {"id": self.id, "title": self.title, "completed": self.completed}
+
 #Update Request DTO
 class TodoUpdateRequest(BaseModel):
     title: str
@@ -1,42 +1,76 @@
-from typing import List, Optional
-from .model import TodoResponse,TodoCreateRequest,TodoUpdateRequest
+import threading
+import msgspec
+from typing import Dict, List, Optional, Tuple
+from .model import Todo,TodoCreateRequest,TodoUpdateRequest
 
-todos:List[TodoResponse] = []
+# dict keyed by id: O(1) get/update/delete, and insertion order is kept
+# (python 3.7+) so listing still comes back in creation order
+todos_by_id: Dict[int, Todo] = {}
 current_id = 1
 
+# writers serialize on this lock and rebuild an immutable tuple snapshot;
+# readers just load the snapshot (one atomic attribute read) so they never
+# observe a half-applied write from another threadpool worker
+_lock = threading.Lock()
+_todos_snapshot: Tuple[Todo, ...] = ()
 
-def get_all() -> List[TodoResponse]:
-    return todos
 
-def get_by_id(todo_id:int)-> Optional[TodoResponse]:
-    for todo in todos:
-        if todo.id == todo_id:
-            return todo
-    return None
+# mirror struct for the wire format — msgspec's C codec beats orjson over
+# dicts for list payloads
+class _TodoStruct(msgspec.Struct):
+    id: int
+    title: str
+    completed: bool
 
-def create_todo(request:TodoCreateRequest)->TodoResponse:
+# pre-encoded JSON bytes for GET /todos — rebuilt eagerly under the writer's
+# lock alongside the snapshot, so the bytes always match the latest committed
+# write and list requests cost a plain bytes return. (encoding lazily on read
+# could race a writer and pin stale bytes until the next mutation)
+_todos_json_cache = b"[]"  # store starts empty
+
+
+def _rebuild_snapshot():
+    global _todos_snapshot, _todos_json_cache
+    snapshot = tuple(todos_by_id.values())
+    _todos_snapshot = snapshot
+    _todos_json_cache = msgspec.json.encode(
+        [_TodoStruct(todo.id, todo.title, todo.completed) for todo in snapshot]
+    )
+
+def get_all() -> Tuple[Todo, ...]:
+    return _todos_snapshot
+
+def get_all_json() -> bytes:
+    return _todos_json_cache
+
+def get_by_id(todo_id:int)-> Optional[Todo]:
+    return todos_by_id.get(todo_id)
+
+def create_todo(request:TodoCreateRequest)->Todo:
     global current_id
-    todo = TodoResponse(id=current_id, title=request.title, completed=False)
-    todos.append(todo)
-    current_id += 1
+    with _lock:
+        # plain slotted dataclass — request.title was already validated by the
+        # inbound DTO, and id/completed are generated here
+        todo = Todo(id=current_id, title=request.title, completed=False)
+        todos_by_id[current_id] = todo
+        current_id += 1
+        _rebuild_snapshot()
     return todo
 
-def update_todo(todo_id:int, request:TodoUpdateRequest)-> Optional[TodoResponse]:
-    # for index, todo in enumerate(todos):
-    #     if todo.id == todo_id:
-    #         updated_todo = TodoResponse(id=todo_id, title=request.title, completed=request.completed)
-    #         todos[index] = updated_todo
-    #         return updated_todo
-    todo=get_by_id(todo_id)
-    if todo:
-        todo.title=request.title
-        todo.completed=request.completed
-        return todo
-    return None
+def update_todo(todo_id:int, request:TodoUpdateRequest)-> Optional[Todo]:
+    with _lock:
+        if todo_id not in todos_by_id:
+            return None
+        # replace instead of mutate so readers holding the old snapshot keep
+        # seeing a consistent (title, completed) pair
+        todo = Todo(id=todo_id, title=request.title, completed=request.completed)
+        todos_by_id[todo_id] = todo
+        _rebuild_snapshot()
+    return todo
 
 def delete_todo(todo_id:int)-> bool:
-    for index, todo in enumerate(todos):
-        if todo.id == todo_id:
-            del todos[index]
-            return True
-    return False
\ No newline at end of file
+    with _lock:
+        removed = todos_by_id.pop(todo_id, None) is not None
+        if removed:
+            _rebuild_snapshot()
+    return removed
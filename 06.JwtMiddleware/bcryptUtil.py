@@ -1,9 +1,13 @@
-from passlib.context import CryptContext
+import os
+import bcrypt
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# direct bcrypt instead of passlib — CryptContext added python-level scheme
+# dispatch around a single C call, and passlib 1.7.4 breaks against bcrypt 4.x
+# anyway. rounds are env-configurable so dev/CI can use a cheap factor
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
\ No newline at end of file
+    return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
@@ -1,22 +1,37 @@
+import time
 from datetime import datetime, timedelta
+from functools import lru_cache
 from jose import jwt, JWTError
 
 SECRET_KEY = "ngisndognosdgirbibi"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# encode the secret once at import — passing a str makes jose re-derive the
+# HMAC key bytes on every encode/decode call
+_SECRET_BYTES = SECRET_KEY.encode()
+
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    return jwt.encode(to_encode, _SECRET_BYTES, algorithm=ALGORITHM)
+
+# the same token gets re-presented on every request of a session, so cache
+# successful decodes. invalid/expired tokens raise and never enter the cache.
+@lru_cache(maxsize=10_000)
+def _decode_token(token: str) -> dict:
+    return jwt.decode(token, _SECRET_BYTES, algorithms=[ALGORITHM])
 
 def verify_token(token: str):
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            return None
-        return username
+        payload = _decode_token(token)
     except JWTError:
-        return None
\ No newline at end of file
+        return None
+    # a cache hit skips jose's expiry check, so re-check it by hand — it's a
+    # float compare, not crypto. time.time() because exp is epoch seconds;
+    # datetime.utcnow().timestamp() would read the naive datetime in local time
+    exp = payload.get("exp")
+    if exp is not None and exp < time.time():
+        return None
+    return payload.get("sub")
@@ -1,15 +1,41 @@
 from fastapi import FastAPI,Request, HTTPException, Depends
+from sqlalchemy.orm import Session
+from starlette.middleware.base import BaseHTTPMiddleware
 from UserLoginDTO import UserLogin
 from UserRegisterDTO import UserRegister
 from jwtUtil import create_access_token , verify_token
 from bcryptUtil import hash_password , verify_password
-from model import User, SessionLocal
+from model import User, get_db
 
 app = FastAPI()
 
+
+#auth middleware — parses the header and verifies the token ONCE per request
+#and stashes the result on request.state. handlers with several dependencies
+#that all need the user no longer repeat the work; public routes just see
+#request.state.user = None and carry on
+class AuthMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        request.state.user = None
+        auth_header = request.headers.get("Authorization")
+        if auth_header:
+            try:
+                scheme, token = auth_header.split()  # splits on whitespace
+            except ValueError:
+                pass
+            else:
+                if scheme.lower() == "bearer":
+                    request.state.user = verify_token(token)
+        return await call_next(request)
+
+
+app.add_middleware(AuthMiddleware)
+
+# sessions come from Depends(get_db) now — the bare SessionLocal() calls were
+# never closed on the error paths, so each failed request leaked a pooled
+# connection until the pool ran dry
 @app.post("/register")
-def register(user: UserRegister):
-    db = SessionLocal()
+def register(user: UserRegister, db: Session = Depends(get_db)):
     existing_user = db.query(User).filter(User.email == user.email).first()
     if existing_user:
         return {"error": "Email already registered"}
@@ -24,8 +50,7 @@ def register(user: UserRegister):
 
 
 @app.post("/login")
-def login(user: UserLogin):
-    db = SessionLocal()
+def login(user: UserLogin, db: Session = Depends(get_db)):
     existing_user = db.query(User).filter(User.name == user.username).first()
     if not existing_user or not verify_password(user.password, existing_user.password):
         return {"error": "Invalid email or password"}
@@ -34,20 +59,11 @@ def login(user: UserLogin):
     return {"access_token": token, "token_type": "bearer"}
 
 
-#auth middleware
+#the dependency just reads what the middleware already resolved
 def get_current_user(request: Request):
-    auth_header = request.headers.get("Authorization")
-    if not auth_header:
-        raise HTTPException(status_code=401, detail="Authorization header missing")
-    try:
-        scheme, token = auth_header.split()  # splits on whitespace
-        if scheme.lower() != "bearer":
-            raise HTTPException(status_code=401, detail="Invalid authentication scheme")
-    except ValueError:
-        raise HTTPException(status_code=401, detail="Invalid Authorization header format")
-    username = verify_token(token)
+    username = request.state.user
     if not username:
-        raise HTTPException(status_code=401, detail="Invalid token")
+        raise HTTPException(status_code=401, detail="Not authenticated")
     return username
 
 
@@ -1,4 +1,5 @@
-from passlib.context import CryptContext 
+import os
+import bcrypt
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
 
@@ -6,14 +7,20 @@ SECRET_KEY = "YOUR_SECRET_KEY"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# direct bcrypt instead of passlib — skips CryptContext's per-call scheme
+# dispatch. rounds are env-configurable so dev/CI can use a cheap factor
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# verified against when login hits an unknown email, so response timing
+# doesn't reveal which emails are registered
+DUMMY_HASH = bcrypt.hashpw(b"not-a-real-password", bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
 
 
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
 
 def hash_password(password):
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
 
 
 def create_access_token(data:dict):
@@ -1,10 +1,14 @@
-from fastapi import FastAPI, HTTPException, Depends, Request, responses
+import msgspec
+from fastapi import FastAPI, HTTPException, Depends, Request, Response, responses
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from starlette.middleware.base import BaseHTTPMiddleware
 from database import Base, engine, SessionLocal
 from models import User, URL
-from schemas import UserRegister, UserLogin, URLCreate, URLOut
-from auth import hash_password, verify_password, create_access_token, verify_token
-from utils import generate_short_code
+from schemas import UserRegister, UserLogin, URLCreate, URLOut, URLOutStruct
+from auth import hash_password, verify_password, create_access_token, verify_token, DUMMY_HASH
+from utils import next_short_code
 
 
 app = FastAPI()
@@ -18,31 +22,56 @@ def get_db():
         db.close()
 
 
-def get_current_user(request: Request, db: Session = Depends(get_db)):
-    auth_header = request.headers.get("Authorization")
-    if not auth_header:
-        raise HTTPException(status_code=401, detail="Authorization header missing")
+def _load_user(email: str):
+    db = SessionLocal()
     try:
-        scheme, token = auth_header.split()
-        if scheme.lower() != "bearer":
-            raise HTTPException(status_code=401, detail="Invalid scheme")
-    except ValueError:
-        raise HTTPException(status_code=401, detail="Invalid header format")
-    
-    email = verify_token(token)
-    if not email:
-        raise HTTPException(status_code=401, detail="Invalid token")
-    
-    user = db.query(User).filter(User.email == email).first()
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
+        return db.query(User).filter(User.email == email).first()
+    finally:
+        db.close()
+
+
+# resolves the user ONCE per request (header parse -> jwt verify -> DB lookup)
+# and stashes it on request.state, so handlers whose dependencies all want the
+# user don't repeat the whole chain. requests without a valid bearer token
+# just get request.state.user = None and public routes work as before.
+class AuthMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        request.state.user = None
+        auth_header = request.headers.get("Authorization")
+        if auth_header:
+            token = None
+            try:
+                scheme, tok = auth_header.split()
+                if scheme.lower() == "bearer":
+                    token = tok
+            except ValueError:
+                pass
+            if token:
+                email = verify_token(token)
+                if email:
+                    # the DB lookup is blocking, keep it off the event loop
+                    request.state.user = await run_in_threadpool(_load_user, email)
+        return await call_next(request)
+
+
+app.add_middleware(AuthMiddleware)
+
+
+# no db dependency anymore — the middleware already resolved the user, so
+# protected handlers don't check out a session just for auth
+def get_current_user(request: Request):
+    user = request.state.user
+    if user is None:
+        raise HTTPException(status_code=401, detail="Not authenticated")
     return user
 
 
 # User Registration
 @app.post("/register")
 def register(user: UserRegister, db: Session = Depends(get_db)):
-    existing = db.query(User).filter(User.email == user.email).first()
+    # only need to know whether the row exists — selecting just the id skips
+    # hydrating a full User object for a yes/no question
+    existing = db.query(User.id).filter(User.email == user.email).first() is not None
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
     
@@ -57,7 +86,12 @@ def register(user: UserRegister, db: Session = Depends(get_db)):
 @app.post("/login")
 def login(user: UserLogin, db: Session = Depends(get_db)):
     db_user = db.query(User).filter(User.email == user.email).first()
-    if not db_user or not verify_password(user.password, db_user.password):
+    if db_user is None:
+        # burn the same bcrypt cost as a real check so response timing
+        # doesn't reveal which emails are registered
+        verify_password(user.password, DUMMY_HASH)
+        raise HTTPException(status_code=401, detail="Invalid email or password")
+    if not verify_password(user.password, db_user.password):
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
     token = create_access_token({"sub": db_user.email})
@@ -66,22 +100,33 @@ def login(user: UserLogin, db: Session = Depends(get_db)):
 
 @app.post("/urls", response_model=URLOut)
 def create_url(url: URLCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    code = generate_short_code()
-    # Ensure uniqueness
-    while db.query(URL).filter(URL.short_code == code).first():
-        code = generate_short_code()
-    
-    db_url = URL(original_url=url.original_url, short_code=code, user_id=current_user.id)
-    db.add(db_url)
-    db.commit()
+    # the unique index on short_code is the real uniqueness guarantee, so just
+    # INSERT and retry on collision. the old SELECT-then-INSERT loop was two
+    # roundtrips per code and racy: two requests could both see the code as
+    # free and then one of them blew up on the index anyway
+    for _ in range(5):
+        code = next_short_code()
+        db_url = URL(original_url=url.original_url, short_code=code, user_id=current_user.id)
+        db.add(db_url)
+        try:
+            db.commit()
+            break
+        except IntegrityError:
+            db.rollback()
+    else:
+        raise HTTPException(status_code=500, detail="Could not allocate a short code")
     db.refresh(db_url)
     return db_url
 
 # Get all URLs of current user
-@app.get("/urls", response_model=list[URLOut])
+@app.get("/urls", responses={200: {"model": list[URLOut]}})
 def get_urls(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    urls = db.query(URL).filter(URL.user_id == current_user.id).all()
-    return urls
+    # project just the two columns the response needs — skips full ORM
+    # hydration and keeps the SELECT narrow
+    urls = db.query(URL.original_url, URL.short_code).filter(URL.user_id == current_user.id).all()
+    # msgspec encodes the structs in C; URLOut stays for the OpenAPI docs only
+    payload = msgspec.json.encode([URLOutStruct(u.original_url, u.short_code) for u in urls])
+    return Response(content=payload, media_type="application/json")
 
 # Redirect short URL
 @app.get("/{code}")
@@ -16,7 +16,9 @@ class URL(Base):
     id = Column(Integer, primary_key=True, index=True)
     original_url = Column(String, nullable=False)
     short_code = Column(String, unique=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    # indexed: GET /urls filters on user_id for every listing, and without an
+    # index that's a sequential scan of the whole table
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
 
     owner = relationship("User", back_populates="urls")
 
@@ -1,3 +1,4 @@
+import msgspec
 from pydantic import BaseModel
 
 class UserRegister(BaseModel):
@@ -17,4 +18,10 @@ class URLOut(BaseModel):
     short_code: str
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+
+# wire-format mirror of URLOut: GET /urls encodes these with msgspec's C
+# codec instead of going through pydantic + the default json encoder
+class URLOutStruct(msgspec.Struct):
+    original_url: str
+    short_code: str
\ No newline at end of file
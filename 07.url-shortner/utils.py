@@ -1,5 +1,22 @@
 import string, random
+from collections import deque
+
+_CHARACTERS = string.ascii_letters + string.digits
+_BATCH_SIZE = 1024
+
+# pre-drawn codes so the per-request cost is a deque pop instead of RNG work;
+# refilled in one go whenever it runs out
+_code_pool = deque()
 
 def generate_short_code(length=6):
-    characters = string.ascii_letters + string.digits
-    return ''.join(random.choices(characters, k=length))
\ No newline at end of file
+    return ''.join(random.choices(_CHARACTERS, k=length))
+
+def next_short_code(length=6):
+    if not _code_pool:
+        _code_pool.extend(generate_short_code(length) for _ in range(_BATCH_SIZE))
+    try:
+        return _code_pool.popleft()
+    except IndexError:
+        # two threadpool workers can both see one code left and race for it —
+        # popleft itself is atomic, so the loser just draws a fresh code
+        return generate_short_code(length)
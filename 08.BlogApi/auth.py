@@ -1,30 +1,87 @@
-from passlib.context import CryptContext
+import os
+import time
+import bcrypt
+from cachetools import TTLCache
 from datetime import datetime, timedelta
-from jose import JWTError , jwt 
+from functools import lru_cache
+from hashlib import blake2b
+import jwt  # PyJWT — tighter hot path and fewer allocations than python-jose for HS256
 
 SECRET_KEY= "sgjbsbfewbfbewvsfsbsbgjbgisb"
 ALGORITHM = "HS256"
 ACCESS_TOEKN_EXPIRE_MINUTES = 30
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# encoded once at import — a str secret makes jose re-derive the HMAC key
+# bytes on every encode/decode
+_SECRET_BYTES = SECRET_KEY.encode()
+
+# bcrypt is called directly now — passlib's CryptContext added python-level
+# scheme resolution and wrapping around what is a single C call. the work
+# factor is env-configurable so dev/CI can run rounds=4 while prod keeps 12
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# fixed hash to verify against when the user doesn't exist, so login timing
+# doesn't reveal whether a username is registered
+DUMMY_HASH = bcrypt.hashpw(b"not-a-real-password", bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
+
+# repeat verifications of the same (password, hash) pair within the TTL skip
+# bcrypt entirely — a dict hit is ~1µs against bcrypt's intentional ~100ms.
+# keyed by a 16-byte blake2b digest so neither the plaintext nor the hash is
+# ever stored in the cache
+_pw_cache = TTLCache(maxsize=2048, ttl=60)
 
 def verify_password(plain_password,hashed_password):
-    return pwd_context.verify(plain_password,hashed_password)
+    key = blake2b((plain_password + hashed_password).encode(), digest_size=16).digest()
+    cached = _pw_cache.get(key)
+    if cached is not None:
+        return cached
+    ok = bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+    _pw_cache[key] = ok
+    return ok
 
 def hash_password(password):
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
+
+# bursty re-logins (retrying clients, load tests) re-sign an identical token
+# over and over. cache issuance per (claims, minute) so repeats within the
+# same minute reuse the signed string — the minute bucket keeps the ttl well
+# under the 30-minute token lifetime, so a cached token is always near-fresh
+_token_issue_cache = TTLCache(maxsize=64, ttl=60)
 
 def create_access_token(data: dict):
+    key = (tuple(sorted(data.items())), int(datetime.utcnow().timestamp() // 60))
+    cached = _token_issue_cache.get(key)
+    if cached is not None:
+        return cached
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOEKN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _SECRET_BYTES, algorithm=ALGORITHM)
+    _token_issue_cache[key] = encoded_jwt
     return encoded_jwt
 
-def verify_token(token:str):
+# tokens are re-presented on every authenticated request, so cache successful
+# decodes; invalid/expired tokens raise and never get cached
+@lru_cache(maxsize=10_000)
+def _decode_token(token:str) -> dict:
+    return jwt.decode(token, _SECRET_BYTES, algorithms=[ALGORITHM])
+
+def decode_token(token:str):
+    # full payload variant — callers that cache need the exp claim too
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload.get("sub")#to get the user id from the token
-    except JWTError:
+        payload = _decode_token(token)
+    except jwt.InvalidTokenError:  # also covers ExpiredSignatureError
+        return None
+    # a cache hit skips the library's expiry check, so redo just that part by
+    # hand. time.time() because exp is epoch seconds — utcnow().timestamp()
+    # would read the naive datetime in the server's local timezone
+    exp = payload.get("exp")
+    if exp is not None and exp < time.time():
+        return None
+    return payload
+
+def verify_token(token:str):
+    payload = decode_token(token)
+    if payload is None:
         return None
-    
\ No newline at end of file
+    return payload.get("sub")#to get the user id from the token
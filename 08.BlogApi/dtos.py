@@ -1,15 +1,26 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+
+# request DTOs are built once per request and thrown away. extra='forbid'
+# skips the buffer pydantic otherwise keeps for unknown fields (and rejects
+# junk payloads early), and frozen=True lets the core schema take its
+# immutable fast path since nothing ever mutates these after validation.
 
 class UserRegistrationDTO(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     username: str
     email: str
     password: str
 
 class UserLoginDTO(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     username: str
     password: str
 
 class PostRequestDTO(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     title: str
     content: str
 
@@ -20,5 +31,6 @@ class PostResponseDTO(BaseModel):
     content: str
     owner_id: int
 
-    class Config:
-        orm_mode = True
\ No newline at end of file
+    # pydantic v2 config — the old `class Config: orm_mode = True` went
+    # through v2's deprecation shim on every use
+    model_config = ConfigDict(from_attributes=True)
@@ -1,72 +1,195 @@
-from fastapi import FastAPI, HTTPException, Depends, Request, responses
-from sqlalchemy.orm import Session
+import hashlib
+import os
+import time
+from cachetools import TTLCache
+from fastapi import FastAPI, HTTPException, Depends, responses
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
 from database import Base, engine, SessionLocal
 from models import User, Post
 from dtos import UserRegistrationDTO, UserLoginDTO, PostRequestDTO, PostResponseDTO
-from auth import create_access_token, verify_token, hash_password, verify_password
+from auth import create_access_token, decode_token, hash_password, verify_password, DUMMY_HASH
 
 
-app = FastAPI()
+# orjson-backed responses app-wide — the stdlib json encoder the default
+# JSONResponse uses is pure python on most paths
+app = FastAPI(default_response_class=ORJSONResponse)
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
 
+# DDL used to run at import time from models.py, which meant every worker (and
+# every dev reload) re-issued the CREATE TABLE IF NOT EXISTS probes on cold
+# start. Now it only runs when explicitly asked for — set INIT_DB=1 for a
+# fresh database; otherwise the schema is assumed to already exist.
+@app.on_event("startup")
+def init_db():
+    if os.getenv("INIT_DB") == "1":
+        Base.metadata.create_all(bind=engine)
 
-def current_user(request: Request, db: Session = Depends(get_db)):
-    auth_header = request.headers.get("Authorization")
-    if auth_header is None or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Unauthorized")
-    try:
-        scheme, token = auth_header.split(" ")
-        if scheme.lower() != "bearer":
+# auth hot-path caches. every /posts request was paying HMAC verification plus
+# a user SELECT; warm tokens now cost two dict lookups. the token entry keeps
+# the exp claim so a token is never trusted past its own expiry even while its
+# cache slot is still live.
+_tok_cache = TTLCache(maxsize=10_000, ttl=30)   # blake2b-128(token) -> (user_id, exp)
+_user_cache = TTLCache(maxsize=5_000, ttl=60)   # user_id -> (id,) row
+
+# hand back the factory, not an open session. handlers open sessions in tight
+# with-blocks around just the SQL, so a pooled connection is held for the
+# duration of the query instead of the whole request — the old Depends(get_db)
+# kept one checked out through bcrypt, JWT signing and serialization too.
+def get_session_factory():
+    return SessionLocal
+
+
+# HTTPBearer does the scheme parse inside Starlette, raises the 401/403 for
+# malformed headers itself, and the DI graph caches its result per request —
+# plus the endpoints show up with an Authorize button in the docs
+_bearer = HTTPBearer(auto_error=True)
+
+
+def current_user(creds: HTTPAuthorizationCredentials = Depends(_bearer), session_factory = Depends(get_session_factory)):
+    token = creds.credentials
+    # hash the token down to 16 bytes so the cache doesn't hold raw JWTs.
+    # blake2b with a native 16-byte digest beats sha256-then-truncate on CPUs
+    # without SHA extensions, and the raw bytes skip the hex-string allocation
+    token_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    now = time.time()
+    cached = _tok_cache.get(token_key)
+    if cached is not None and (cached[1] is None or cached[1] > now):
+        user_id = cached[0]
+    else:
+        payload = decode_token(token)
+        user_id = payload.get("sub") if payload else None
+        if user_id is None:
             raise HTTPException(status_code=401, detail="Unauthorized")
-    except ValueError:
-        raise HTTPException(status_code=401, detail="Unauthorized")
-    user_id = verify_token(token)
-    if user_id is None:
-        raise HTTPException(status_code=401, detail="Unauthorized")
-    user = db.query(User).filter(User.id == user_id).first()
+        _tok_cache[token_key] = (user_id, payload.get("exp"))
+    user = _user_cache.get(user_id)
     if user is None:
-        raise HTTPException(status_code=401, detail="Unauthorized")
+        # Core-style select of just the id — the handlers only need user.id,
+        # so hydrating a full mapped User (identity map, all columns) per
+        # request was wasted work. the session only exists for this one query.
+        with session_factory() as db:
+            user = db.execute(select(User.id).where(User.id == user_id)).first()
+        if user is None:
+            raise HTTPException(status_code=401, detail="Unauthorized")
+        _user_cache[user_id] = user
     return user
 
 
+# register/login are async so the event loop stays responsive, with the
+# blocking pieces (queries and especially bcrypt, which is ~100ms by design)
+# pushed to the threadpool explicitly. the DB here is postgres behind sync
+# SQLAlchemy, so run_in_threadpool is the way to overlap the I/O and crypto —
+# an async driver would mean swapping the whole session layer.
 @app.post("/register")
-def register(user_dto: UserRegistrationDTO, db: Session = Depends(get_db)):
-    existing_user = db.query(User).filter(User.email == user_dto.email).first()
+async def register(user_dto: UserRegistrationDTO, session_factory = Depends(get_session_factory)):
+    # presence check only — two columns, no ORM hydration. name is unique now
+    # too, so check it here rather than letting the constraint 500 later
+    def _check():
+        with session_factory() as db:
+            return db.execute(
+                select(User.email, User.name).where(
+                    (User.email == user_dto.email) | (User.name == user_dto.username)
+                )
+            ).first()
+
+    existing_user = await run_in_threadpool(_check)
     if existing_user:
-        raise HTTPException(status_code=400, detail="Email already registered")
-    hashed_password = hash_password(user_dto.password)
+        if existing_user.email == user_dto.email:
+            raise HTTPException(status_code=400, detail="Email already registered")
+        raise HTTPException(status_code=400, detail="Username already taken")
+    # no connection is held while bcrypt grinds through the hash
+    hashed_password = await run_in_threadpool(hash_password, user_dto.password)
     new_user = User(name=user_dto.username, email=user_dto.email, password=hashed_password)
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+
+    def _save():
+        with session_factory() as db:
+            db.add(new_user)
+            try:
+                db.commit()
+            except IntegrityError:
+                # a concurrent register can still win the race between the
+                # check above and this commit — same 400, not a 500
+                return False
+        return True
+
+    if not await run_in_threadpool(_save):
+        raise HTTPException(status_code=400, detail="Email or username already registered")
     return {"message": "User registered successfully"}
 
 
 @app.post("/login")
-def login(user_dto: UserLoginDTO, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.name == user_dto.username).first()
-    if not user or not verify_password(user_dto.password, user.password):
+async def login(user_dto: UserLoginDTO, session_factory = Depends(get_session_factory)):
+    # just the two columns the login path needs: id for the token, password
+    # for the bcrypt check
+    def _lookup():
+        with session_factory() as db:
+            return db.execute(
+                select(User.id, User.password).where(User.name == user_dto.username)
+            ).first()
+
+    user = await run_in_threadpool(_lookup)
+    # the session is already closed here — bcrypt and token signing run
+    # without pinning a pooled connection
+    if user is None:
+        # burn the same bcrypt cost as a real check so response timing
+        # doesn't reveal which usernames are registered
+        await run_in_threadpool(verify_password, user_dto.password, DUMMY_HASH)
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    if not await run_in_threadpool(verify_password, user_dto.password, user.password):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     access_token = create_access_token(data={"sub": str(user.id)})
     return {"access_token": access_token, "token_type": "bearer"}
 
 @app.post("/posts", response_model=PostResponseDTO)
-def create_post(post_dto: PostRequestDTO, user: User = Depends(current_user), db: Session = Depends(get_db)):
+def create_post(post_dto: PostRequestDTO, user = Depends(current_user), session_factory = Depends(get_session_factory)):
     new_post = Post(title=post_dto.title, content=post_dto.content, owner_id=user.id)
-    db.add(new_post)
-    db.commit()
-    db.refresh(new_post)
+    with session_factory() as db:
+        db.add(new_post)
+        db.commit()
+        db.refresh(new_post)  # response needs the generated id
     return new_post
 
-@app.get("/posts", response_model=list[PostResponseDTO])
-def get_posts(db: Session = Depends(get_db),user: User = Depends(current_user)):
-    user=db.query(User).filter(User.id == user.id).first()
-    posts = user.posts # we can do this cause base on the relationship we defined in the models.py file between user and posts
-    #back populate will allow us to access the posts of a user directly from the user object without needing to query the posts table separately
-    return posts
\ No newline at end of file
+@app.get("/posts", responses={200: {"model": list[PostResponseDTO]}})
+def get_posts(user = Depends(current_user), session_factory = Depends(get_session_factory)):
+    # one narrow SELECT straight off the posts table (the old version
+    # re-fetched the user and lazy-loaded the relationship — two queries and a
+    # full mapper materialization per request). construct() skips validating
+    # rows that just came out of our own table, and responses= keeps the
+    # schema in the docs without the outbound validation pass.
+    with session_factory() as db:
+        rows = db.execute(
+            select(Post.id, Post.title, Post.content, Post.owner_id).where(Post.owner_id == user.id)
+        ).mappings().all()
+    # connection is back in the pool before any serialization happens. plain
+    # dicts instead of DTOs here — orjson has a fast path for list[dict] and
+    # jsonable_encoder has nothing left to do. PostResponseDTO remains the
+    # documented schema via responses= above.
+    return [dict(row) for row in rows]
+
+
+@app.get("/me")
+def me(user = Depends(current_user), session_factory = Depends(get_session_factory)):
+    # the relationship is lazy="raise", so the posts have to be loaded
+    # explicitly — selectinload batches them into a second IN-query alongside
+    # the user SELECT instead of the classic lazy-load-per-access N+1
+    with session_factory() as db:
+        row = db.execute(
+            select(User).options(selectinload(User.posts)).where(User.id == user.id)
+        ).scalar_one_or_none()
+        if row is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        # flatten to plain dicts while the session is still open, so nothing
+        # touches ORM attributes after the connection goes back to the pool
+        return {
+            "id": row.id,
+            "name": row.name,
+            "email": row.email,
+            "posts": [
+                {"id": post.id, "title": post.title, "content": post.content}
+                for post in row.posts
+            ],
+        }
\ No newline at end of file
@@ -1,15 +1,19 @@
 from sqlalchemy import Column , Integer , String , ForeignKey
 from sqlalchemy.orm import relationship
-from database import Base,engine 
+from database import Base
 
 class User(Base):
     __tablename__ = "users"
     id = Column(Integer,primary_key=True,index=True)
-    name = Column(String)
+    # login looks users up by name, so it needs an index just like email —
+    # without one every login attempt was a full table scan
+    name = Column(String,unique=True,index=True,nullable=False)
     email = Column(String,unique=True,index=True)
     password = Column(String)
 
-    posts = relationship("Post", back_populates="owner")
+    # lazy="raise" so an accidental user.posts access blows up loudly instead
+    # of silently issuing an N+1 SELECT — load posts with an explicit query
+    posts = relationship("Post", back_populates="owner", lazy="raise")
 
 
 class Post(Base):
@@ -19,6 +23,4 @@ class Post(Base):
     content = Column(String)
     owner_id = Column(Integer,ForeignKey("users.id"))
 
-    owner = relationship("User", back_populates="posts")
-
-Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    owner = relationship("User", back_populates="posts")
\ No newline at end of file
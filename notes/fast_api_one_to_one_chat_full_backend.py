@@ -2,10 +2,14 @@
 # FastAPI One-to-One Chat Backend (Room Based)
 # =============================================
 
+import asyncio
+import os
+from collections import deque
+
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import Dict, List
+from typing import Dict, List, Set
 from uuid import uuid4
 
 app = FastAPI(title="One-to-One Chat App")
@@ -25,11 +29,15 @@ app.add_middleware(
 # In-Memory Storage
 # -----------------------------
 
-# Active rooms
-rooms: Dict[str, List[WebSocket]] = {}
+# Active rooms — sets make membership checks and removal O(1) instead of
+# scanning a list on every disconnect/broadcast
+rooms: Dict[str, Set[WebSocket]] = {}
 
-# Optional: store message history (in-memory)
-chat_history: Dict[str, List[str]] = {}
+# Optional: store message history (in-memory), bounded per room — an
+# unbounded list grows forever on a busy room. deque(maxlen=...) gives O(1)
+# append with automatic eviction of the oldest message.
+CHAT_HISTORY_LIMIT = int(os.getenv("CHAT_HISTORY_LIMIT", "500"))
+chat_history: Dict[str, deque] = {}
 
 
 # -----------------------------
@@ -50,33 +58,51 @@ class ConnectionManager:
         await websocket.accept()
 
         if room_code not in rooms:
-            rooms[room_code] = []
-            chat_history[room_code] = []
+            rooms[room_code] = set()
+            chat_history[room_code] = deque(maxlen=CHAT_HISTORY_LIMIT)
 
         if len(rooms[room_code]) >= 2:
             await websocket.send_text("Room is full")
             await websocket.close()
             return False
 
-        rooms[room_code].append(websocket)
+        rooms[room_code].add(websocket)
         return True
 
     def disconnect(self, websocket: WebSocket, room_code: str):
-        if room_code in rooms and websocket in rooms[room_code]:
-            rooms[room_code].remove(websocket)
+        connections = rooms.get(room_code)
+        if connections is None:
+            return
+        connections.discard(websocket)
 
-            if len(rooms[room_code]) == 0:
-                del rooms[room_code]
-                del chat_history[room_code]
+        if len(connections) == 0:
+            del rooms[room_code]
+            del chat_history[room_code]
 
     async def send_personal_message(self, message: str, websocket: WebSocket):
         await websocket.send_text(message)
 
     async def broadcast(self, message: str, room_code: str, sender: WebSocket):
-        if room_code in rooms:
-            for connection in rooms[room_code]:
-                if connection != sender:
-                    await connection.send_text(message)
+        connections = rooms.get(room_code)
+        if not connections:
+            return
+        recipients = list(connections - {sender})  # set difference, no per-message scan
+        if not recipients:
+            return
+        # encode the payload ONCE and share the bytes across recipients —
+        # send_text made Starlette re-encode the same string per connection.
+        # gather overlaps the socket writes instead of serializing them, and
+        # return_exceptions keeps one dead client from aborting the fan-out
+        # for everyone else.
+        payload = message.encode()
+        results = await asyncio.gather(
+            *(connection.send_bytes(payload) for connection in recipients),
+            return_exceptions=True,
+        )
+        # drop any socket whose send blew up so we stop broadcasting to it
+        for connection, result in zip(recipients, results):
+            if isinstance(result, Exception):
+                self.disconnect(connection, room_code)
 
 
 manager = ConnectionManager()
@@ -89,8 +115,8 @@ manager = ConnectionManager()
 @app.post("/create-room", response_model=RoomCreateResponse)
 def create_room():
     room_code = str(uuid4())[:8]
-    rooms[room_code] = []
-    chat_history[room_code] = []
+    rooms[room_code] = set()
+    chat_history[room_code] = deque(maxlen=CHAT_HISTORY_LIMIT)
     return {"room_code": room_code}
 
 
@@ -103,7 +129,7 @@ def list_rooms():
 def get_chat_history(room_code: str):
     if room_code not in chat_history:
         raise HTTPException(status_code=404, detail="Room not found")
-    return {"messages": chat_history[room_code]}
+    return {"messages": list(chat_history[room_code])}
 
 
 # -----------------------------